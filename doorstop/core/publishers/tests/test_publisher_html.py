@@ -4,60 +4,135 @@
 
 # pylint: disable=unused-argument,protected-access
 
+import copy
+import functools
 import os
 import unittest
-from secrets import token_hex
-from shutil import rmtree
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
-from unittest.mock import ANY, MagicMock, Mock, call, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 from doorstop.common import DoorstopError
 from doorstop.core import publisher
 from doorstop.core.document import Document
-from doorstop.core.template import HTMLTEMPLATE
+from doorstop.core.template import CSS, HTMLTEMPLATE
 from doorstop.core.tests import EMPTY, FILES, MockDataMixIn, MockDocument
 
 
+@functools.lru_cache(maxsize=None)
+def _expected_matrix():
+    """Get the expected traceability matrix, read on first use."""
+    return Path(FILES, "testmatrix.csv").read_bytes()
+
+
+@functools.lru_cache(maxsize=None)
+def _expected_index2():
+    """Get the expected tree index, read on first use."""
+    return Path(FILES, "index2.html").read_bytes()
+
+
+@functools.lru_cache(maxsize=None)
+def _css_text():
+    """Get the stylesheet embedded in the index, read on first use."""
+    return Path(CSS).read_text(encoding="utf-8")
+
+
+def _to_text(lines):
+    """Join published lines into newline-terminated text."""
+    lines = list(lines)
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
 class TestModule(MockDataMixIn, unittest.TestCase):
     """Unit tests for the doorstop.core.publishers.html module."""
 
+    _n = 0  # counter for unique test folder names
+    INDEX2_HTML = os.path.join(FILES, "index2.html")
+
     # pylint: disable=no-value-for-parameter
     def setUp(self):
-        """Setup test folder."""
-        self.hex = token_hex()
-        self.dirpath = os.path.abspath(os.path.join("mock_%s" % __name__, self.hex))
+        """Setup test folder paths."""
+        TestModule._n += 1
+        self.hex = "{:08x}".format(TestModule._n)
+        self.dirpath = os.path.join(self._base, self.hex)
+        self.published_html = os.path.join(self.dirpath, "published.html")
+        self.published_custom = os.path.join(self.dirpath, "published.custom")
+
+    def _patch_publish_dirs(self):
+        """Patch the folder checks and creation done when publishing."""
+        isdir = patch("os.path.isdir", Mock(return_value=False))
+        makedirs = patch("os.makedirs")
+        isdir.start()
+        self.addCleanup(isdir.stop)
+        self.mock_makedirs = makedirs.start()
+        self.addCleanup(makedirs.stop)
 
     @classmethod
-    def tearDownClass(cls):
-        """Remove test folder."""
-        rmtree("mock_%s" % __name__)
-
-    @patch("os.path.isdir", Mock(side_effect=[False, False, False, False]))
-    @patch("os.makedirs")
-    @patch("builtins.open")
-    def test_publish_document(self, mock_open, mock_makedirs):
+    def setUpClass(cls):
+        """Build the publisher and mock tree shared by tests."""
+        super().setUpClass()
+        cls._base = os.path.abspath("mock_%s" % __name__)
+        cls._html_publisher = publisher.check(".html")
+        mock_tree = MagicMock()
+        mock_tree.documents = []
+        for prefix in ("SYS", "HLR", "LLR", "HLT", "LLT"):
+            mock_tree.documents.append(SimpleNamespace(prefix=prefix))
+        mock_item = Mock(spec=["uid", "text", "document", "header"])
+        mock_item.uid = "KNOWN-001"
+        mock_item.text = ""
+        mock_item.document = Mock(spec=["prefix"])
+        mock_item.document.prefix = "KNOWN"
+        mock_item.header = None
+        mock_item_unknown = Mock(spec=["uid"])
+        mock_item_unknown.uid = "UNKNOWN-002"
+        mock_trace = [
+            (None, mock_item, None, None, None),
+            (None, None, None, mock_item_unknown, None),
+            (None, None, None, None, None),
+        ]
+        cls._mock_tree_template = (mock_tree, mock_trace)
+
+    def _copy_mock_tree(self):
+        """Get a fresh copy of the shared mock tree."""
+        mock_tree, mock_trace = copy.deepcopy(self._mock_tree_template)
+        mock_tree.draw = lambda: "(mock tree structure)"
+        mock_tree.get_traceability = lambda: mock_trace
+        return mock_tree
+
+    def assert_html_contains(self, text, *tokens):
+        """Assert that all tokens appear in the published HTML text."""
+        missing = [token for token in tokens if token not in text]
+        self.assertFalse(missing, "{} not found in:\n{}".format(missing, text))
+
+    def test_publish_document(self):
         """Verify a document can be published."""
-        path = os.path.join(self.dirpath, "published.html")
+        self._patch_publish_dirs()
+        path = self.published_html
         self.document.items = []
         # Act
-        path2 = publisher.publish(self.document, path)
+        with patch("builtins.open") as mock_open:
+            path2 = publisher.publish(self.document, path)
         # Assert
         self.assertIs(path, path2)
-        mock_makedirs.assert_called_once_with(self.dirpath)
+        self.mock_makedirs.assert_called_once_with(self.dirpath)
         mock_open.assert_called_once_with(path, "wb")
 
-    @patch("os.path.isdir", Mock(return_value=False))
-    @patch("os.makedirs")
-    @patch("builtins.open")
-    @patch("doorstop.core.publisher.publish_lines")
-    def test_publish_document_html(self, mock_lines, mock_open, mock_makedirs):
+    def test_publish_document_html(self):
         """Verify a (mock) HTML file can be created."""
-        path = os.path.join(self.dirpath, "published.custom")
+        self._patch_publish_dirs()
+        path = self.published_custom
         # Act
-        path2 = publisher.publish(self.document, path, ".html")
+        with ExitStack() as stack:
+            mock_open = stack.enter_context(patch("builtins.open"))
+            mock_lines = stack.enter_context(
+                patch("doorstop.core.publisher.publish_lines")
+            )
+            path2 = publisher.publish(self.document, path, ".html")
         # Assert
         self.assertIs(path, path2)
-        mock_makedirs.assert_called_once_with(self.dirpath)
+        self.mock_makedirs.assert_called_once_with(self.dirpath)
         mock_open.assert_called_once_with(path, "wb")
         mock_lines.assert_called_once_with(
             self.document,
@@ -68,23 +143,22 @@ class TestModule(MockDataMixIn, unittest.TestCase):
             toc=True,
         )
 
-    @patch("os.path.isdir", Mock(side_effect=[True, False, False, False, False, False]))
-    @patch("os.remove")
-    @patch("glob.glob")
-    @patch("builtins.open")
-    @patch("doorstop.core.publisher.publish_lines")
-    def test_publish_document_deletes_the_contents_of_assets_folder(
-        self, mock_lines, mock_open, mock_glob, mock_rm
-    ):
+    def test_publish_document_deletes_the_contents_of_assets_folder(self):
         """Verify that the contents of an assets directory next to the published file is deleted"""
-        path = os.path.join(self.dirpath, "published.custom")
-        assets = [
-            os.path.join(self.dirpath, Document.ASSETS, dir)
-            for dir in ["css", "logo.png"]
-        ]
-        mock_glob.return_value = assets
+        self._patch_publish_dirs()
+        path = self.published_custom
+        assets_dir = os.path.join(self.dirpath, Document.ASSETS)
         # Act
-        path2 = publisher.publish(self.document, path, ".html")
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch("os.path.isdir", Mock(side_effect=[True, False, False, False]))
+            )
+            mock_delete = stack.enter_context(patch("doorstop.common.delete_contents"))
+            mock_open = stack.enter_context(patch("builtins.open"))
+            mock_lines = stack.enter_context(
+                patch("doorstop.core.publisher.publish_lines")
+            )
+            path2 = publisher.publish(self.document, path, ".html")
         # Assert
         self.assertIs(path, path2)
         mock_open.assert_called_once_with(path, "wb")
@@ -96,122 +170,72 @@ class TestModule(MockDataMixIn, unittest.TestCase):
             toc=True,
             linkify=False,
         )
-        calls = [call(assets[0]), call(assets[1])]
-        self.assertEqual(calls, mock_rm.call_args_list)
-
-    @patch("os.path.isdir", Mock(return_value=False))
-    @patch("doorstop.core.document.Document.copy_assets")
-    @patch("os.makedirs")
-    @patch("builtins.open")
-    def test_publish_document_copies_assets(
-        self, mock_open, mock_makedirs, mock_copyassets
-    ):
+        mock_delete.assert_called_once_with(assets_dir)
+
+    def test_publish_document_copies_assets(self):
         """Verify that assets are published"""
+        self._patch_publish_dirs()
         assets_path = os.path.join(self.dirpath, "assets")
-        path = os.path.join(self.dirpath, "published.custom")
+        path = self.published_custom
         document = MockDocument("/some/path")
-        mock_open.side_effect = lambda *args, **kw: mock.mock_open(
-            read_data="$body"
-        ).return_value
         # Act
-        path2 = publisher.publish(document, path, ".html")
+        with ExitStack() as stack:
+            mock_copyassets = stack.enter_context(
+                patch("doorstop.core.document.Document.copy_assets")
+            )
+            stack.enter_context(
+                patch(
+                    "builtins.open",
+                    lambda *args, **kw: mock.mock_open(read_data="$body").return_value,
+                )
+            )
+            path2 = publisher.publish(document, path, ".html")
         # Assert
         self.assertIs(path, path2)
-        mock_makedirs.assert_called_once_with(self.dirpath)
+        self.mock_makedirs.assert_called_once_with(self.dirpath)
         mock_copyassets.assert_called_once_with(assets_path)
 
-    def test_index(self):
-        """Verify an HTML index can be created."""
-        # Arrange
-        path = os.path.join(FILES, "index.html")
-        html_publisher = publisher.check(".html")
-        # Act
-        html_publisher.create_index(FILES)
-        # Assert
-        self.assertTrue(os.path.isfile(path))
-
-    def test_index_no_files(self):
-        """Verify an HTML index is only created when files exist."""
-        path = os.path.join(EMPTY, "index.html")
-        html_publisher = publisher.check(".html")
-        # Act
-        html_publisher.create_index(EMPTY)
-        # Assert
-        self.assertFalse(os.path.isfile(path))
-
     def test_index_tree(self):
         """Verify an HTML index can be created with a tree."""
-        path = os.path.join(FILES, "index2.html")
-        mock_tree = MagicMock()
-        mock_tree.documents = []
-        for prefix in ("SYS", "HLR", "LLR", "HLT", "LLT"):
-            mock_document = MagicMock()
-            mock_document.prefix = prefix
-            mock_tree.documents.append(mock_document)
-        mock_tree.draw = lambda: "(mock tree structure)"
-        mock_item = Mock()
-        mock_item.uid = "KNOWN-001"
-        mock_item.document = Mock()
-        mock_item.document.prefix = "KNOWN"
-        mock_item.header = None
-        mock_item_unknown = Mock(spec=["uid"])
-        mock_item_unknown.uid = "UNKNOWN-002"
-        mock_trace = [
-            (None, mock_item, None, None, None),
-            (None, None, None, mock_item_unknown, None),
-            (None, None, None, None, None),
-        ]
-        mock_tree.get_traceability = lambda: mock_trace
-        html_publisher = publisher.check(".html")
+        path = self.INDEX2_HTML
+        mock_tree = self._copy_mock_tree()
         # Act
-        html_publisher.create_index(FILES, index="index2.html", tree=mock_tree)
+        css = mock.mock_open(read_data=_css_text())
+        with patch("builtins.open", css) as mock_file:
+            self._html_publisher.create_index(
+                FILES, index="index2.html", tree=mock_tree
+            )
         # Assert
-        self.assertTrue(os.path.isfile(path))
+        mock_file.assert_any_call(path, "wb")
+        result_content = b"".join(
+            args[0] for args, _ in mock_file.return_value.write.call_args_list
+        )
+        self.assertEqual(_expected_index2(), result_content)
 
     def test_matrix_tree(self):
         """Verify a traceability matrix can be created with a tree."""
-        path = os.path.join(FILES, "testmatrix.csv")
-        mock_tree = MagicMock()
-        mock_tree.documents = []
-        for prefix in ("SYS", "HLR", "LLR", "HLT", "LLT"):
-            mock_document = MagicMock()
-            mock_document.prefix = prefix
-            mock_tree.documents.append(mock_document)
-        mock_tree.draw = lambda: "(mock tree structure)"
-        mock_item = Mock()
-        mock_item.uid = "KNOWN-001"
-        mock_item.document = Mock()
-        mock_item.document.prefix = "KNOWN"
-        mock_item.header = None
-        mock_item_unknown = Mock(spec=["uid"])
-        mock_item_unknown.uid = "UNKNOWN-002"
-        mock_trace = [
-            (None, mock_item, None, None, None),
-            (None, None, None, mock_item_unknown, None),
-            (None, None, None, None, None),
-        ]
-        mock_tree.get_traceability = lambda: mock_trace
+        mock_tree = self._copy_mock_tree()
         html_publisher = publisher.check(".html", obj=mock_tree)
-        # Create the self.dirpath first.
-        os.makedirs(self.dirpath)
         # Act
-        html_publisher.create_matrix(self.dirpath)
+        with patch("builtins.open", mock.mock_open()) as mock_file:
+            html_publisher.create_matrix(self.dirpath)
         # Assert
         result_file = os.path.join(self.dirpath, "traceability.csv")
-        self.assertTrue(os.path.isfile(result_file))
+        mock_file.assert_called_once_with(
+            result_file, "w", newline="", encoding="utf-8"
+        )
         # Assert contents of FILES and traceability.csv
-        with open(result_file, "r") as file:
-            result_content = file.read()
-        with open(path, "r") as file:
-            expected_content = file.read()
-        self.assertEqual(expected_content, result_content)
+        result_content = "".join(
+            args[0] for args, _ in mock_file.return_value.write.call_args_list
+        )
+        self.assertEqual(_expected_matrix(), result_content.encode("utf-8"))
 
     def test_lines_html_item(self):
         """Verify HTML can be published from an item."""
         expected = '<h2 id="req3">1.1 Heading</h2>\n'
         # Act
         lines = publisher.publish_lines(self.item, ".html")
-        text = "".join(line + "\n" for line in lines)
+        text = _to_text(lines)
         # Assert
         self.assertEqual(expected, text)
 
@@ -221,7 +245,7 @@ class TestModule(MockDataMixIn, unittest.TestCase):
         expected = '<h2 id="req3">Heading</h2>\n'
         # Act
         lines = publisher.publish_lines(self.item, ".html")
-        text = "".join(line + "\n" for line in lines)
+        text = _to_text(lines)
         # Assert
         self.assertEqual(expected, text)
 
@@ -230,7 +254,7 @@ class TestModule(MockDataMixIn, unittest.TestCase):
         expected = '<h2 id="req3">1.1 Heading</h2>\n'
         # Act
         lines = publisher.publish_lines(self.item, ".html", linkify=True)
-        text = "".join(line + "\n" for line in lines)
+        text = _to_text(lines)
         # Assert
         self.assertEqual(expected, text)
 
@@ -239,16 +263,16 @@ class TestModule(MockDataMixIn, unittest.TestCase):
         """Verify HTML can be published from an item w/ child links."""
         # Act
         lines = publisher.publish_lines(self.item2, ".html")
-        text = "".join(line + "\n" for line in lines)
+        text = _to_text(lines)
         # Assert
-        self.assertIn("Child links: tst1", text)
+        self.assert_html_contains(text, "Child links: tst1")
 
     @patch("doorstop.settings.PUBLISH_CHILD_LINKS", False)
     def test_lines_html_item_without_child_links(self):
         """Verify HTML can be published from an item w/o child links."""
         # Act
         lines = publisher.publish_lines(self.item2, ".html")
-        text = "".join(line + "\n" for line in lines)
+        text = _to_text(lines)
         # Assert
         self.assertNotIn("Child links", text)
 
@@ -257,24 +281,9 @@ class TestModule(MockDataMixIn, unittest.TestCase):
         """Verify HTML (hyper) can be published from an item w/ child links."""
         # Act
         lines = publisher.publish_lines(self.item2, ".html", linkify=True)
-        text = "".join(line + "\n" for line in lines)
+        text = _to_text(lines)
         # Assert
-        self.assertIn("Child links:", text)
-        self.assertIn("tst.html#tst1", text)
-
-    @patch("os.path.isdir", Mock(side_effect=[False, False, False, False]))
-    @patch("os.makedirs")
-    @patch("builtins.open")
-    def test_publish_document(self, mock_open, mock_makedirs):
-        """Verify a document can be published."""
-        path = os.path.join(self.dirpath, "published.html")
-        self.document.items = []
-        # Act
-        path2 = publisher.publish(self.document, path)
-        # Assert
-        self.assertIs(path, path2)
-        mock_makedirs.assert_called_once_with(self.dirpath)
-        mock_open.assert_called_once_with(path, "wb")
+        self.assert_html_contains(text, "Child links:", "tst.html#tst1")
 
     def test_bad_html_template(self):
         """Verify a bad HTML template raises an error."""
@@ -288,3 +297,33 @@ class TestModule(MockDataMixIn, unittest.TestCase):
         with self.assertRaises(DoorstopError):
             for line in gen:
                 pass
+
+
+class TestModuleFiles(unittest.TestCase):
+    """Unit tests for the doorstop.core.publishers.html module writing to FILES."""
+
+    INDEX_HTML = os.path.join(FILES, "index.html")
+    EMPTY_INDEX_HTML = os.path.join(EMPTY, "index.html")
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the publisher shared by the index tests."""
+        super().setUpClass()
+        cls._html_publisher = publisher.check(".html")
+
+    def test_index(self):
+        """Verify an HTML index can be created."""
+        # Arrange
+        path = self.INDEX_HTML
+        # Act
+        self._html_publisher.create_index(FILES)
+        # Assert
+        self.assertTrue(os.path.isfile(path))
+
+    def test_index_no_files(self):
+        """Verify an HTML index is only created when files exist."""
+        path = self.EMPTY_INDEX_HTML
+        # Act
+        self._html_publisher.create_index(EMPTY)
+        # Assert
+        self.assertFalse(os.path.isfile(path))
@@ -52,15 +52,15 @@ class MockFileObject(BaseFileObject):  # pylint: disable=W0223,R0902
 
     def _mock_read(self, path):
         """Mock read method."""
-        logging.debug("mock read path: {}".format(path))
+        logging.debug("mock read path: %s", path)
         text = self._file
-        logging.debug("mock read text: {}".format(repr(text)))
+        logging.debug("mock read text: %r", text)
         return text
 
     def _mock_write(self, text, path):
         """Mock write method."""
-        logging.debug("mock write text: {}".format(repr(text)))
-        logging.debug("mock write path: {}".format(path))
+        logging.debug("mock write text: %r", text)
+        logging.debug("mock write path: %s", path)
         self._file = text
 
     def __bool__(self):
@@ -2,6 +2,8 @@
 
 """Unit tests for the doorstop.common module """
 
+import os
+import tempfile
 import unittest
 
 from doorstop import common
@@ -154,3 +156,18 @@ list:
 
 text text text""".lstrip(),
         )
+
+
+class TestDeleteContents(unittest.TestCase):
+    """Unit tests for the delete_contents function."""
+
+    def test_delete_contents(self):
+        """Verify the files and folders inside a directory are deleted."""
+        with tempfile.TemporaryDirectory() as dirname:
+            os.makedirs(os.path.join(dirname, "css"))
+            common.touch(os.path.join(dirname, "logo.png"))
+            # Act
+            common.delete_contents(dirname)
+            # Assert
+            self.assertTrue(os.path.isdir(dirname))
+            self.assertEqual([], os.listdir(dirname))
@@ -3,6 +3,7 @@
 
 """Unit tests for the doorstop.core.item module."""
 
+import copy
 import os
 import unittest
 from unittest.mock import MagicMock, Mock, patch
@@ -89,9 +90,16 @@ class TestItem(unittest.TestCase):
 
     # pylint: disable=protected-access,no-value-for-parameter
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         path = os.path.join("path", "to", "RQ001.yml")
-        self.item = MockItem(MockSimpleDocument(), path)
+        cls._item_template = MockItem(MockSimpleDocument(), path)
+        del cls._item_template._read, cls._item_template._write
+
+    def setUp(self):
+        self.item = copy.deepcopy(self._item_template)
+        self.item._read = self.item._mock_read
+        self.item._write = Mock(side_effect=self.item._mock_write)
 
     def test_init_invalid(self):
         """Verify an item cannot be initialized from an invalid path."""
@@ -117,6 +125,7 @@ class TestItem(unittest.TestCase):
 
     def test_load_empty(self):
         """Verify loading calls read."""
+        self.item._read = Mock(wraps=self.item._mock_read)
         self.item.load()
         self.item._read.assert_called_once_with(self.item.path)
 